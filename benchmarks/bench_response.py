@@ -0,0 +1,69 @@
+"""Benchmark decoding a polled JSON response with debug logging off.
+
+Compares the former pipeline (decode the body for a debug log, then
+parse it again from text) with common.response.ResponseDecoder.
+
+    python benchmarks/bench_response.py
+"""
+import json
+import logging
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'custom_components'))
+
+from common.response import ResponseDecoder  # noqa: E402
+
+NUMBER = 20000
+REPEAT = 5
+
+_LOGGER = logging.getLogger('bench_response')
+_LOGGER.setLevel(logging.WARNING)
+
+MINUTELY = {
+    'station': {'name': '서울', 'id': '123', 'latitude': '37.5',
+                'longitude': '126.9'},
+    'wind': {'wdir': '120', 'wspd': '1.2'},
+    'precipitation': {'type': '0', 'sinceOntime': '0.00'},
+    'sky': {'code': 'SKY_A01', 'name': '맑음'},
+    'rain': {key: '0.00' for key in 'abcdefghij'},
+    'temperature': {'tc': '20.1', 'tmax': '25', 'tmin': '12'},
+    'humidity': '45',
+    'pressure': {'surface': '1000', 'seaLevel': '1012'},
+    'lightning': '0',
+    'timeObservation': '2026-10-19 10:00:00'
+}
+CONTENT = json.dumps({'weather': {'minutely': [MINUTELY] * 5}},
+                     ensure_ascii=False).encode('utf8')
+
+
+class FakeResponse:
+    """Response carrying the raw body only."""
+
+    url = 'https://api2.sktelecom.com/weather/current/minutely'
+    content = CONTENT
+
+
+def previous():
+    """Decode the body for the log and parse it a second time."""
+    _LOGGER.debug('JSON Response: %s', CONTENT.decode('utf8'))
+    return json.loads(CONTENT.decode('utf-8'))
+
+
+def current(decoder=ResponseDecoder(_LOGGER), response=FakeResponse()):
+    """Parse the raw body once through the ResponseDecoder."""
+    return decoder.decode(response)
+
+
+def main():
+    """Print the best time per response of each pipeline."""
+    print(f'payload: {len(CONTENT)} bytes')
+    for func in (previous, current):
+        best = min(timeit.repeat(func, number=NUMBER, repeat=REPEAT))
+        print(f'{func.__name__:>8}: {best / NUMBER * 1e6:.1f} us/response')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,172 @@
+"""Persisted last good values of API endpoints."""
+import asyncio
+import copy
+import logging
+import threading
+import time
+
+from homeassistant.core import callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 30
+CATCH_UP_DELAY = 5
+
+
+class EndpointCache:
+    """Serve endpoints from their last good value while they fail.
+
+    Endpoints served from the cache are marked stale. Once a request
+    succeeds again, the registered refresh of every stale endpoint runs
+    one at a time, the oldest value first.
+
+    Values are copied in and out, so callers may change what they get
+    while the store is writing, and the entries are guarded by a lock
+    because fetches run in executor threads.
+    """
+
+    def __init__(self, hass, key, max_staleness):
+        """Initialize the cache stored under a storage key."""
+        self.hass = hass
+        self.store = Store(hass, STORAGE_VERSION, key)
+        self.max_staleness = max_staleness.total_seconds()
+        self.entries = {}
+        self.stale = set()
+        self.refreshers = {}
+        self._catching_up = False
+        self._save_pending = False
+        self._lock = threading.Lock()
+
+    async def async_load(self):
+        """Load the stored values."""
+        self.entries = await self.store.async_load() or {}
+
+    def prune(self, prefix, keep):
+        """Forget the endpoints under a key prefix, except keep."""
+        with self._lock:
+            for key in [key for key in self.entries
+                        if key.startswith(prefix) and key != keep]:
+                self.entries.pop(key, None)
+                self.stale.discard(key)
+            for key in [key for key in self.refreshers
+                        if key.startswith(prefix) and key != keep]:
+                self.refreshers.pop(key, None)
+
+    def latest(self, prefix):
+        """Return the newest cached value under a key prefix."""
+        with self._lock:
+            keys = [key for key in self.entries if key.startswith(prefix)]
+            if not keys:
+                return None
+            key = max(keys, key=lambda k: self.entries[k]['time'])
+            return copy.deepcopy(self.entries[key]['data'])
+
+    def rename(self, key, new_key):
+        """Move the value of an endpoint to another key."""
+        with self._lock:
+            if key in self.entries:
+                self.entries[new_key] = self.entries.pop(key)
+            if key in self.stale:
+                self.stale.discard(key)
+                self.stale.add(new_key)
+
+    def register(self, key, refresh):
+        """Register the refresh run for a stale endpoint on catch-up."""
+        self.refreshers[key] = refresh
+
+    def age(self, key):
+        """Return the age in seconds of the value of an endpoint."""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        return time.time() - entry['time']
+
+    def attributes(self, key):
+        """Return the state attributes describing a cached value."""
+        entry = self.entries.get(key)
+        if entry is None:
+            return {}
+        return {
+            'data_updated': dt_util.as_local(dt_util.utc_from_timestamp(
+                entry['time'])).isoformat(),
+            'data_age': round(time.time() - entry['time']),
+            'stale': key in self.stale
+        }
+
+    def fetch(self, key, request):
+        """Return the result of request, or the cached one if it fails."""
+        try:
+            data = request()
+        except Exception:
+            with self._lock:
+                entry = self.entries.get(key)
+                if entry is None:
+                    raise
+                self.stale.add(key)
+                data = copy.deepcopy(entry['data'])
+            age = time.time() - entry['time']
+            if age > self.max_staleness:
+                raise
+            _LOGGER.warning('Serving %s from cache, %d seconds old',
+                            key, age)
+            return data
+
+        with self._lock:
+            self.entries[key] = {
+                'data': copy.deepcopy(data), 'time': time.time()}
+            self.stale.discard(key)
+        self.hass.add_job(self._async_save)
+        if self.stale and not self._catching_up:
+            self.hass.add_job(self._async_catch_up)
+        return data
+
+    @callback
+    def _async_save(self):
+        """Schedule saving the cached values unless already scheduled.
+
+        Rescheduling would push the save back on every fetch, so that
+        endpoints polled more often than SAVE_DELAY were never written.
+        """
+        if self._save_pending:
+            return
+        self._save_pending = True
+        self.store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self):
+        """Return the cached values to write to the store."""
+        self._save_pending = False
+        with self._lock:
+            return copy.deepcopy(self.entries)
+
+    async def _async_catch_up(self):
+        """Refresh stale endpoints one by one, the oldest first."""
+        if self._catching_up:
+            return
+        self._catching_up = True
+        try:
+            with self._lock:
+                keys = sorted(self.stale,
+                              key=lambda k: self.entries[k]['time'])
+            for key in keys:
+                refresh = self.refreshers.get(key)
+                if refresh is None or key not in self.stale:
+                    continue
+                _LOGGER.debug('Catching up %s', key)
+                try:
+                    await self.hass.async_add_executor_job(refresh)
+                except Exception:
+                    break
+                if key in self.stale:
+                    break
+                await asyncio.sleep(CATCH_UP_DELAY)
+        finally:
+            self._catching_up = False
+
+
+async def async_remove_cache(hass, key):
+    """Remove the stored values of a cache."""
+    await Store(hass, STORAGE_VERSION, key).async_remove()
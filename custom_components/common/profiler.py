@@ -0,0 +1,147 @@
+"""On-demand sampling profiler for the custom components."""
+import asyncio
+import logging
+import os
+import sys
+import threading
+from collections import Counter
+from datetime import datetime
+
+import voluptuous as vol
+
+from homeassistant.core import callback
+
+_LOGGER = logging.getLogger(__name__)
+
+COMMON_PATH = os.path.dirname(os.path.abspath(__file__))
+
+SERVICE_PROFILE = 'profile'
+CONF_SECONDS = 'seconds'
+CONF_INTERVAL = 'interval'
+CONF_TOP = 'top'
+
+PROFILE_SCHEMA = vol.Schema({
+    vol.Optional(CONF_SECONDS, default=60):
+        vol.All(vol.Coerce(float), vol.Range(min=1, max=3600)),
+    vol.Optional(CONF_INTERVAL, default=0.005):
+        vol.All(vol.Coerce(float), vol.Range(min=0.001, max=1)),
+    vol.Optional(CONF_TOP, default=10):
+        vol.All(vol.Coerce(int), vol.Range(min=1))
+})
+
+
+class SamplingProfiler:
+    """Sample the stacks running the code of a set of packages.
+
+    Only stacks passing through paths are kept. Each sample is credited
+    to its innermost frame under paths or shared_paths, so helpers shared
+    between components show up under their own name.
+
+    Nothing is installed while idle: a sampling thread only exists for
+    the duration of a profile run.
+    """
+
+    def __init__(self, paths, interval, shared_paths=()):
+        """Initialize the profiler for the given package directories."""
+        self.paths = tuple(os.path.join(path, '') for path in paths)
+        self.credited = self.paths + tuple(
+            os.path.join(path, '') for path in shared_paths)
+        self.interval = interval
+        self.stacks = Counter()
+        self.functions = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start sampling in a background thread."""
+        self._thread = threading.Thread(
+            target=self._run, name='common_profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop sampling and wait for the sampling thread."""
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        """Collect samples until stopped."""
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                self._collect(frame)
+
+    def _collect(self, frame):
+        """Record the code objects of a stack if it runs our code."""
+        stack = []
+        function = None
+        matched = False
+        while frame is not None:
+            code = frame.f_code
+            if function is None and \
+                    code.co_filename.startswith(self.credited):
+                function = code
+            if not matched and code.co_filename.startswith(self.paths):
+                matched = True
+            stack.append(code)
+            frame = frame.f_back
+        if not matched:
+            return
+        self.stacks[tuple(stack)] += 1
+        self.functions[function] += 1
+        self.samples += 1
+
+    @staticmethod
+    def _label(code):
+        """Return the label of a code object."""
+        return '{} ({}:{})'.format(
+            code.co_name, os.path.basename(code.co_filename),
+            code.co_firstlineno)
+
+    def hot_functions(self, top):
+        """Return our innermost functions with the most samples."""
+        return [(self._label(code), count)
+                for code, count in self.functions.most_common(top)]
+
+    def write_collapsed(self, path):
+        """Write the samples in the collapsed-stack format."""
+        with open(path, 'w') as file:
+            for stack, count in self.stacks.most_common():
+                labels = ';'.join(
+                    self._label(code) for code in reversed(stack))
+                file.write(f'{labels} {count}\n')
+
+
+@callback
+def async_register_profile_service(hass, domain, paths, shared_paths=()):
+    """Register the profile service of a component."""
+
+    async def async_profile(call):
+        """Profile the component for the requested duration."""
+        profiler = SamplingProfiler(
+            paths, call.data[CONF_INTERVAL], shared_paths)
+        profiler.start()
+        try:
+            await asyncio.sleep(call.data[CONF_SECONDS])
+        finally:
+            await hass.async_add_executor_job(profiler.stop)
+
+        path = hass.config.path('{}.profile.{}.collapsed'.format(
+            domain, datetime.now().strftime('%Y%m%d%H%M%S')))
+        await hass.async_add_executor_job(profiler.write_collapsed, path)
+
+        summary = '\n'.join(
+            f'{count:>6} {function}'
+            for function, count in profiler.hot_functions(
+                call.data[CONF_TOP]))
+        _LOGGER.warning('%s profile: %d samples written to %s\n%s',
+                        domain, profiler.samples, path, summary)
+        hass.components.persistent_notification.async_create(
+            f'{profiler.samples} samples written to `{path}`\n\n'
+            f'```\n{summary}\n```',
+            title=f'{domain} profile')
+
+    hass.services.async_register(
+        domain, SERVICE_PROFILE, async_profile, schema=PROFILE_SCHEMA)
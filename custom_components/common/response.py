@@ -0,0 +1,53 @@
+"""Decode JSON API responses once, from the raw body."""
+import json
+import logging
+from itertools import count
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+MAX_LOG_BYTES = 2048
+
+
+def loads(content):
+    """Parse a JSON body with the fastest available backend."""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+class ResponseDecoder:
+    """Decode response bodies and log a sample of them in debug.
+
+    max_log_bytes and log_every are constructor arguments only; the
+    components use the defaults, which log every body up to 2 kB.
+    """
+
+    def __init__(self, logger, max_log_bytes=MAX_LOG_BYTES, log_every=1):
+        """Initialize the decoder for a logger."""
+        self.logger = logger
+        self.max_log_bytes = max_log_bytes
+        self.log_every = log_every
+        self._counter = count()
+
+    def decode(self, response):
+        """Return the parsed JSON body of a response."""
+        content = response.content
+        if self.logger.isEnabledFor(logging.DEBUG) and \
+                next(self._counter) % self.log_every == 0:
+            self.log(response.url, content)
+        return loads(content)
+
+    def log(self, url, content):
+        """Log the head of a body, capped to max_log_bytes."""
+        size = len(content)
+        if size > self.max_log_bytes:
+            self.logger.debug(
+                'JSON Response (%s, %d of %d bytes): %s', url,
+                self.max_log_bytes, size,
+                content[:self.max_log_bytes].decode('utf8', 'replace'))
+        else:
+            self.logger.debug('JSON Response (%s): %s', url,
+                              content.decode('utf8', 'replace'))
@@ -0,0 +1,257 @@
+"""Pooled HTTP transport shared by the custom components."""
+import logging
+import socket
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import callback
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_TRANSPORT = 'common_transport'
+SERVICE_TRANSPORT_STATS = 'transport_stats'
+
+DEFAULT_MAX_CONNECTIONS = 4
+DEFAULT_TIMEOUT = 10
+DEFAULT_DNS_TTL = 300
+
+
+class DNSCache:
+    """Cache host name resolutions for a time to live."""
+
+    def __init__(self, ttl=DEFAULT_DNS_TTL):
+        """Initialize the cache."""
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, host, port):
+        """Return the cached addresses of a host, resolving if expired."""
+        key = (host, port)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and entry[1] > now:
+            return entry[0]
+        try:
+            infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        except OSError as ex:
+            _LOGGER.debug('Failed to resolve %s: %s', host, ex)
+            return [host]
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        with self._lock:
+            self._entries[key] = (addresses, now + self.ttl)
+        return addresses
+
+    def invalidate(self, host, port):
+        """Forget the addresses of a host."""
+        with self._lock:
+            self._entries.pop((host, port), None)
+
+
+class HostStats:
+    """Count requests and new connections of a host."""
+
+    def __init__(self):
+        """Initialize the counters."""
+        self.requests = 0
+        self.connections = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def increment(self, counter):
+        """Increment a counter from any thread."""
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def as_dict(self):
+        """Return the counters with the connection reuse ratio."""
+        with self._lock:
+            requests_, connections, errors = \
+                self.requests, self.connections, self.errors
+        reused = max(requests_ - errors - connections, 0)
+        return {
+            'requests': requests_,
+            'connections': connections,
+            'reused': reused,
+            'reuse_ratio': round(reused / (requests_ - errors), 3)
+            if requests_ > errors else None,
+            'errors': errors
+        }
+
+
+def _pool_classes(dns_cache, stats, pool_timeout):
+    """Return connection pool classes bound to a DNS cache and stats."""
+
+    def get_conn(base):
+        def _get_conn(self, timeout=None):
+            # requests never passes a pool timeout, and a blocking pool
+            # would otherwise wait forever for a free connection.
+            return base._get_conn(
+                self, pool_timeout if timeout is None else timeout)
+        return _get_conn
+
+    def new_conn(base):
+        def _new_conn(self):
+            # urllib3 derives host, used for SNI and certificate checks,
+            # from _dns_host, so only swap it while opening the socket.
+            stats.increment('connections')
+            host = self._dns_host
+            error = None
+            try:
+                for address in dns_cache.resolve(host, self.port):
+                    self._dns_host = address
+                    try:
+                        return base._new_conn(self)
+                    except ConnectTimeoutError as ex:
+                        error = ex
+            finally:
+                self._dns_host = host
+            dns_cache.invalidate(host, self.port)
+            raise error
+        return _new_conn
+
+    connection = type('CachedHTTPConnection', (HTTPConnection,),
+                      {'_new_conn': new_conn(HTTPConnection)})
+    https_connection = type('CachedHTTPSConnection', (HTTPSConnection,),
+                            {'_new_conn': new_conn(HTTPSConnection)})
+    return {
+        'http': type('CachedHTTPConnectionPool', (HTTPConnectionPool,), {
+            'ConnectionCls': connection,
+            '_get_conn': get_conn(HTTPConnectionPool)}),
+        'https': type('CachedHTTPSConnectionPool', (HTTPSConnectionPool,), {
+            'ConnectionCls': https_connection,
+            '_get_conn': get_conn(HTTPSConnectionPool)})
+    }
+
+
+class HostAdapter(HTTPAdapter):
+    """HTTP adapter keeping a bounded keep-alive pool for one host."""
+
+    def __init__(self, dns_cache, stats, max_connections, pool_timeout):
+        """Initialize the adapter."""
+        self.dns_cache = dns_cache
+        self.stats = stats
+        self.pool_timeout = pool_timeout
+        super().__init__(pool_connections=1, pool_maxsize=max_connections,
+                         pool_block=True)
+
+    def init_poolmanager(self, *args, **kwargs):
+        """Create the pool manager with DNS cached connections."""
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = _pool_classes(
+            self.dns_cache, self.stats, self.pool_timeout)
+
+
+class Transport:
+    """Keep-alive HTTP sessions with a connection pool per host."""
+
+    def __init__(self, dns_ttl=DEFAULT_DNS_TTL):
+        """Initialize the transport."""
+        self.dns_cache = DNSCache(dns_ttl)
+        self._hosts = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def configure_host(self, url, max_connections=DEFAULT_MAX_CONNECTIONS,
+                       timeout=DEFAULT_TIMEOUT):
+        """Set the connection limit and timeout of the host of a url.
+
+        The connection limit of a host is fixed by its first configuration.
+        Waiting for a free pooled connection is bounded by the timeout.
+        """
+        with self._lock:
+            self._configure_host(url, max_connections, timeout)
+
+    def _configure_host(self, url, max_connections=DEFAULT_MAX_CONNECTIONS,
+                        timeout=DEFAULT_TIMEOUT):
+        """Set up the pool of the host of a url, with the lock held."""
+        host = urlsplit(url).netloc
+        if host in self._hosts:
+            self._hosts[host][2] = timeout
+            return self._hosts[host]
+        stats = HostStats()
+        session = requests.Session()
+        adapter = HostAdapter(self.dns_cache, stats, max_connections, timeout)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        self._hosts[host] = [session, stats, timeout]
+        return self._hosts[host]
+
+    def get(self, url, **kwargs):
+        """Send a GET request through the pool of the url host."""
+        return self.request('GET', url, **kwargs)
+
+    def request(self, method, url, **kwargs):
+        """Send a request through the pool of the url host."""
+        host = urlsplit(url).netloc
+        with self._lock:
+            if self._closed:
+                raise requests.ConnectionError('Transport is closed')
+            entry = self._hosts.get(host) or self._configure_host(url)
+            session, stats, timeout = entry
+        kwargs.setdefault('timeout', timeout)
+        stats.increment('requests')
+        try:
+            return session.request(method, url, **kwargs)
+        except Exception:
+            stats.increment('errors')
+            raise
+
+    def stats(self):
+        """Return the connection statistics of every host."""
+        with self._lock:
+            hosts = list(self._hosts.items())
+        return {host: entry[1].as_dict() for host, entry in hosts}
+
+    def close(self):
+        """Close every session and refuse further requests."""
+        with self._lock:
+            self._closed = True
+            for session, _, _ in self._hosts.values():
+                session.close()
+            self._hosts.clear()
+
+
+@callback
+def async_get_transport(hass):
+    """Return the transport of hass, closed when Home Assistant stops."""
+    transport = hass.data.get(DATA_TRANSPORT)
+    if transport is None:
+        transport = hass.data[DATA_TRANSPORT] = Transport()
+
+        def close_transport(event):
+            """Close the transport on shutdown."""
+            _LOGGER.debug('Transport statistics: %s', transport.stats())
+            transport.close()
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, close_transport)
+    return transport
+
+
+@callback
+def async_register_stats_service(hass, domain):
+    """Register a service reporting the transport statistics."""
+
+    @callback
+    def async_transport_stats(call):
+        """Log and notify the connection statistics of every host."""
+        stats = async_get_transport(hass).stats()
+        summary = '\n'.join(
+            '{}: {}'.format(host, ', '.join(
+                f'{name} {value}' for name, value in host_stats.items()))
+            for host, host_stats in stats.items())
+        _LOGGER.warning('Transport statistics:\n%s', summary)
+        hass.components.persistent_notification.async_create(
+            f'```\n{summary}\n```', title='Transport statistics')
+
+    hass.services.async_register(
+        domain, SERVICE_TRANSPORT_STATS, async_transport_stats)
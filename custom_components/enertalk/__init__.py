@@ -1,6 +1,7 @@
 """The Enertalk integration."""
 import asyncio
 import logging
+import os
 
 import voluptuous as vol
 
@@ -17,15 +18,26 @@ from homeassistant.helpers import config_entry_oauth2_flow, \
     config_validation as cv
 
 from . import api, config_flow
+from ..common.cache import EndpointCache, async_remove_cache
+from ..common.profiler import (
+    COMMON_PATH,
+    async_register_profile_service,
+)
+from ..common.transport import (
+    async_get_transport,
+    async_register_stats_service,
+)
 from .const import (
     AUTH,
     MONITORED_CONDITIONS,
     CONF_REAL_TIME_INTERVAL,
     CONF_BILLING_INTERVAL,
+    CONF_MAX_STALENESS,
     DATA_CONF,
     DOMAIN,
     OAUTH2_AUTHORIZE,
     OAUTH2_TOKEN,
+    ROLLOVER,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -41,6 +53,9 @@ CONFIG_SCHEMA = vol.Schema(
                 vol.Optional(
                     CONF_BILLING_INTERVAL, default=timedelta(seconds=1800)
                 ): vol.All(cv.time_period, cv.positive_timedelta),
+                vol.Optional(
+                    CONF_MAX_STALENESS, default=timedelta(hours=6)
+                ): vol.All(cv.time_period, cv.positive_timedelta),
                 vol.Optional(CONF_MONITORED_CONDITIONS):
                     vol.All(cv.ensure_list, [vol.In(MONITORED_CONDITIONS)]),
             }
@@ -55,6 +70,9 @@ async def async_setup(hass: HomeAssistant, config: dict):
     hass.data[DOMAIN] = {
         DATA_CONF: config[DOMAIN]
     }
+    async_register_profile_service(
+        hass, DOMAIN, [os.path.dirname(__file__)], [COMMON_PATH])
+    async_register_stats_service(hass, DOMAIN)
 
     if DOMAIN not in config:
         return True
@@ -74,14 +92,25 @@ async def async_setup(hass: HomeAssistant, config: dict):
     return True
 
 
+def _cache_key(entry: ConfigEntry):
+    """Return the storage key of the endpoint cache of an entry."""
+    return f'{DOMAIN}.{entry.entry_id}'
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Set up EnerTalk from a config entry."""
     impl = await config_entry_oauth2_flow.async_get_config_entry_implementation(
         hass, entry
     )
 
+    cache = EndpointCache(
+        hass, _cache_key(entry),
+        hass.data[DOMAIN][DATA_CONF][CONF_MAX_STALENESS])
+    await cache.async_load()
+
     hass.data[DOMAIN][entry.entry_id] = {
-        AUTH: api.ConfigEntryEnerTalkAuth(hass, entry, impl)
+        AUTH: api.ConfigEntryEnerTalkAuth(
+            hass, entry, impl, async_get_transport(hass), cache)
     }
 
     hass.async_create_task(
@@ -95,6 +124,13 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     await asyncio.gather(
         hass.config_entries.async_forward_entry_unload(entry, "sensor")
     )
-    hass.data[DOMAIN].pop(entry.entry_id)
+    data = hass.data[DOMAIN].pop(entry.entry_id)
+    if ROLLOVER in data:
+        data[ROLLOVER].async_stop()
 
     return True
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry):
+    """Remove the stored endpoint cache of a removed entry."""
+    await async_remove_cache(hass, _cache_key(entry))
@@ -3,11 +3,11 @@ import logging
 from asyncio import run_coroutine_threadsafe
 from time import sleep
 
-import requests
 from homeassistant import config_entries, core
 from homeassistant.helpers import config_entry_oauth2_flow
 
-from .const import API_ENDPOINT
+from ..common.response import ResponseDecoder
+from .const import API_ENDPOINT, API_MAX_CONNECTIONS, API_TIMEOUT
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -20,12 +20,19 @@ class ConfigEntryEnerTalkAuth:
             hass: core.HomeAssistant,
             config_entry: config_entries.ConfigEntry,
             impl: config_entry_oauth2_flow.AbstractOAuth2Implementation,
+            transport,
+            cache,
     ):
         """Initialize EnerTalk Auth."""
         self.hass = hass
         self.session = config_entry_oauth2_flow.OAuth2Session(
             hass, config_entry, impl
         )
+        self.decoder = ResponseDecoder(_LOGGER)
+        self.transport = transport
+        self.cache = cache
+        self.transport.configure_host(
+            API_ENDPOINT, API_MAX_CONNECTIONS, API_TIMEOUT)
 
     def refresh_tokens(self, ):
         """Refresh new EnerTalk tokens using Home Assistant OAuth2 session."""
@@ -39,22 +46,28 @@ class ConfigEntryEnerTalkAuth:
             'accept-version': '2.0.0'
         }
         try:
-            response = requests.get(f'{API_ENDPOINT}/{url}',
-                                    headers=headers, timeout=10)
-            _LOGGER.debug('JSON Response: %s', response.content.decode('utf8'))
-            return response
+            return self.transport.get(f'{API_ENDPOINT}/{url}',
+                                      headers=headers)
         except Exception as ex:
             _LOGGER.error('Failed to update EnerToken status Error: %s', ex)
             raise
 
-    def get(self, url):
+    def get(self, url, key=None, cache=True):
+        """Return an endpoint, from the cache while it fails."""
+        if not cache:
+            return self._get(url)
+        return self.cache.fetch(key or url, lambda: self._get(url))
+
+    def _get(self, url):
         response = self.request(url)
-        if response.status_code == 401:
-            error_type = response.json()['type']
-            if error_type == 'UnauthorizedError':
-                self.refresh_tokens()
-                # Sleep for 1 sec to prevent authentication related
-                # timeouts after a token refresh.
-                sleep(1)
-                response = self.request(url)
-        return response.json()
+        if response.status_code == 401 and \
+                self.decoder.decode(response).get('type') == \
+                'UnauthorizedError':
+            self.refresh_tokens()
+            # Sleep for 1 sec to prevent authentication related
+            # timeouts after a token refresh.
+            sleep(1)
+            response = self.request(url)
+        # Error bodies must not reach the cache as a good value.
+        response.raise_for_status()
+        return self.decoder.decode(response)
@@ -20,11 +20,20 @@ MONITORED_CONDITIONS = list(REAL_TIME_MON_COND.keys()) + \
                         list(BILLING_MON_COND.keys())
 
 AUTH = "enertalk_auth"
+ROLLOVER = "enertalk_rollover"
 CONF_REAL_TIME_INTERVAL = 'real_time_interval'
 CONF_BILLING_INTERVAL = 'billing_interval'
+CONF_MAX_STALENESS = 'max_staleness'
 
 OAUTH2_AUTHORIZE = "https://auth.enertalk.com/authorization"
 OAUTH2_TOKEN = "https://auth.enertalk.com/token"
 API_ENDPOINT = 'https://api2.enertalk.com'
+API_MAX_CONNECTIONS = 4
+API_TIMEOUT = 10
 
 DATA_CONF = "enertalk_conf"
+
+# Seconds to wait after local midnight before refreshing billing periods
+# and the largest random spread of the refreshes across sites.
+ROLLOVER_DELAY = 60
+ROLLOVER_JITTER = 300
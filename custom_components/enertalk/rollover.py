@@ -0,0 +1,110 @@
+"""Refresh EnerTalk billing periods right after they roll over."""
+import logging
+import random
+from datetime import datetime, time, timedelta
+
+from homeassistant.core import callback
+from homeassistant.helpers.event import (
+    async_call_later,
+    async_track_point_in_utc_time,
+)
+
+from .const import ROLLOVER_DELAY, ROLLOVER_JITTER
+
+_LOGGER = logging.getLogger(__name__)
+
+DAILY_TYPES = ('Today', 'Yesterday')
+MONTHLY_TYPES = ('Month', 'Estimate')
+
+
+def next_midnight(timezone, now):
+    """Return the local midnight following now in a timezone."""
+    date = now.astimezone(timezone).date() + timedelta(1)
+    return timezone.localize(datetime.combine(date, time()))
+
+
+class BillingRolloverScheduler:
+    """Schedule jittered billing refreshes at each local midnight.
+
+    Today and Yesterday roll over at every midnight. Month and Estimate
+    roll over at the midnight ending the site's billing cycle, taken from
+    the end of their last result, or at every midnight while it is
+    unknown.
+    """
+
+    def __init__(self, hass, billing_apis):
+        """Initialize the scheduler for a list of EnerBillingApi."""
+        self.hass = hass
+        self.zones = {}
+        for api in billing_apis:
+            self.zones.setdefault(str(api.timezone), []).append(api)
+        self._unsubs = {}
+        self._pending = set()
+
+    @callback
+    def async_start(self):
+        """Schedule the next boundary of every timezone."""
+        for zone in self.zones:
+            self._async_schedule(zone)
+
+    @callback
+    def async_stop(self):
+        """Cancel all scheduled boundaries and refreshes."""
+        for unsub in list(self._unsubs.values()) + list(self._pending):
+            unsub()
+        self._unsubs.clear()
+        self._pending.clear()
+
+    @callback
+    def _async_schedule(self, zone):
+        """Schedule the next boundary of a timezone."""
+        timezone = self.zones[zone][0].timezone
+        boundary = next_midnight(timezone, datetime.now(tz=timezone))
+
+        @callback
+        def async_boundary(now):
+            """Spread the refreshes of the sites of a timezone."""
+            self._async_schedule(zone)
+            sites = {}
+            for api in self.zones[zone]:
+                if api.type in DAILY_TYPES or \
+                        (api.type in MONTHLY_TYPES and
+                         api.cycle_ended(boundary)):
+                    sites.setdefault(api.site_id, []).append(api)
+            for apis in sites.values():
+                self._async_refresh_later(
+                    boundary, apis, random.uniform(0, ROLLOVER_JITTER))
+
+        self._unsubs[zone] = async_track_point_in_utc_time(
+            self.hass, async_boundary,
+            boundary + timedelta(seconds=ROLLOVER_DELAY))
+
+    @callback
+    def _async_refresh_later(self, boundary, apis, delay):
+        """Refresh the billing periods of a site after a delay."""
+        unsub = None
+
+        async def async_refresh(now):
+            """Refresh the billing periods and write their states."""
+            self._pending.discard(unsub)
+            await self.hass.async_add_executor_job(
+                self._refresh, boundary, apis)
+            for api in apis:
+                for entity in api.entities:
+                    if entity.hass is not None:
+                        entity.async_write_ha_state()
+
+        unsub = async_call_later(self.hass, delay, async_refresh)
+        self._pending.add(unsub)
+
+    @staticmethod
+    def _refresh(boundary, apis):
+        """Roll over and refresh billing periods in the executor."""
+        for api in apis:
+            api.roll_over(boundary)
+            try:
+                api.update(no_throttle=True)
+            except Exception as ex:
+                _LOGGER.warning(
+                    'Failed to refresh %s billing of site %s after '
+                    'rollover: %s', api.type, api.site_id, ex)
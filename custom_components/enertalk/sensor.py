@@ -1,7 +1,7 @@
 """Support for the EnerTalk Sensor."""
 
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime, time, timedelta
 
 from homeassistant.const import CONF_MONITORED_CONDITIONS
 from homeassistant.helpers.entity import Entity
@@ -16,7 +16,9 @@ from .const import (
     BILLING_MON_COND,
     CONF_REAL_TIME_INTERVAL,
     CONF_BILLING_INTERVAL,
+    ROLLOVER,
 )
+from .rollover import MONTHLY_TYPES, BillingRolloverScheduler
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -30,6 +32,7 @@ async def async_setup_entry(hass, entry, async_add_entities):
     billing_interval = data_conf[CONF_BILLING_INTERVAL]
 
     auth = hass.data[DOMAIN][entry.entry_id][AUTH]
+    billing_apis = []
 
     def find_entities(device):
         """Find all entities."""
@@ -50,6 +53,7 @@ async def async_setup_entry(hass, entry, async_add_entities):
                 if billing_type not in billing_api:
                     billing_api[billing_type] = EnerBillingApi(
                         auth, device, billing_type, billing_interval)
+                    billing_apis.append(billing_api[billing_type])
                 entities += [
                     EnerTalkBillingSensor(
                         device, variable,
@@ -63,15 +67,18 @@ async def async_setup_entry(hass, entry, async_add_entities):
         """Retrieve EnerTalk entities."""
         entities = []
 
-        devices = auth.get('sites')
-        for device in devices:
-            device['timezone'] = timezone(device['timezone'])
+        for device in auth.get('sites'):
+            device = dict(device, timezone=timezone(device['timezone']))
             entities.extend(find_entities(device))
 
         return entities
 
     async_add_entities(await hass.async_add_executor_job(get_entities), True)
 
+    scheduler = BillingRolloverScheduler(hass, billing_apis)
+    scheduler.async_start()
+    hass.data[DOMAIN][entry.entry_id][ROLLOVER] = scheduler
+
 
 class EnerTalkSensor(Entity):
     """Representation of a EnerTalk Sensor."""
@@ -129,14 +136,81 @@ class EnerBillingApi:
         self.site_id = device['id']
         self.timezone = device['timezone']
         self.type = billing_type
+        self.prefix = f'sites/{self.site_id}/usages/billing/{billing_type}/'
+        self.key = None
+        self.today_date = None
+        self.next_rollover = None
+        self.cycle_start = None
+        self.cycle_end = None
+        self.entities = []
         self.result = None
         self.update = Throttle(interval)(self.update)
+        if self.type in MONTHLY_TYPES:
+            self.set_cycle(self.api.cache.latest(self.prefix))
+        self.roll_over(datetime.now(tz=self.timezone))
+
+    def refresh(self):
+        """Refresh the billing period and its sensor states."""
+        self.update(no_throttle=True)
+        for entity in self.entities:
+            if entity.hass is not None:
+                entity.schedule_update_ha_state()
+
+    def set_cycle(self, result):
+        """Keep the billing cycle boundaries of a Month/Estimate result."""
+        if not result or 'start' not in result or 'end' not in result:
+            return
+        self.cycle_start = datetime.fromtimestamp(
+            result['start'] / 1000, self.timezone)
+        self.cycle_end = datetime.fromtimestamp(
+            result['end'] / 1000, self.timezone)
+
+    def cycle_ended(self, now):
+        """Return True if the known billing cycle has ended by now."""
+        return self.cycle_end is None or now >= self.cycle_end
+
+    def period(self, now):
+        """Return the cache period of the billing type at now."""
+        date = now.astimezone(self.timezone).date()
+        if self.type == 'Today':
+            return date.isoformat()
+        elif self.type == 'Yesterday':
+            return (date - timedelta(1)).isoformat()
+        # Month and Estimate follow the meter reading cycle of the site,
+        # and the cycle following the known one starts at its end.
+        if self.cycle_end is not None and now >= self.cycle_end:
+            return self.cycle_end.date().isoformat()
+        if self.cycle_start is not None:
+            return self.cycle_start.date().isoformat()
+        return None
+
+    def set_key(self, period):
+        """Key the cache by period and forget the previous periods.
+
+        A failure after a rollover then never serves the previous period.
+        """
+        self.key = self.prefix + (period or 'current')
+        self.api.cache.prune(self.prefix, self.key)
+        self.api.cache.register(self.key, self.refresh)
+
+    def roll_over(self, now):
+        """Compute the period boundaries of the local day of now."""
+        date = now.astimezone(self.timezone).date()
+        self.today_date = self.timezone.localize(
+            datetime.combine(date, time()))
+        self.next_rollover = self.timezone.localize(
+            datetime.combine(date + timedelta(1), time()))
+        self.set_key(self.period(now))
 
     def update(self):
         """Update function for updating api information."""
         param = ''
-        today_date = datetime.now(tz=self.timezone) \
-            .replace(hour=0, minute=0, second=0, microsecond=0)
+        now = datetime.now(tz=self.timezone)
+        if now >= self.next_rollover or \
+                (self.type in MONTHLY_TYPES and self.cycle_end is not None
+                 and now >= self.cycle_end):
+            self.roll_over(now)
+        today_date = self.today_date
         if self.type == 'Today':
             param = f'?period=day&start={today_date.timestamp() * 1000}'
         elif self.type == 'Yesterday':
@@ -146,9 +220,16 @@ class EnerBillingApi:
         elif self.type == 'Estimate':
             param = '?timeType=pastToFuture'
 
-        self.result = self.api.get(
-            f'sites/{self.site_id}/usages/billing{param}')
-        self.result['charge'] = self.result['bill']['charge']
+        result = self.api.get(
+            f'sites/{self.site_id}/usages/billing{param}', self.key)
+        self.result = dict(result, charge=result['bill']['charge'])
+
+        if self.type in MONTHLY_TYPES:
+            self.set_cycle(self.result)
+            period = self.period(now)
+            if period is not None and self.prefix + period != self.key:
+                self.api.cache.rename(self.key, self.prefix + period)
+                self.set_key(period)
 
 
 class EnerTalkRealTimeSensor(EnerTalkSensor):
@@ -159,6 +240,7 @@ class EnerTalkRealTimeSensor(EnerTalkSensor):
         """Initialize the Real Time Sensor."""
         super().__init__(device, variable, variable_info)
         self.site_id = self._device['id']
+        self.url = f'sites/{self.site_id}/usages/realtime'
         self.api = api
         self.result = None
         self.update = Throttle(interval)(self.update)
@@ -194,8 +276,8 @@ class EnerTalkRealTimeSensor(EnerTalkSensor):
 
     def update(self):
         """Update function for updating api information."""
-        self.result = self.api.get(
-            f'sites/{self.site_id}/usages/realtime')
+        # Real time power is only useful fresh, so it is never cached.
+        self.result = self.api.get(self.url, cache=False)
 
 
 class EnerTalkBillingSensor(EnerTalkSensor):
@@ -205,6 +287,7 @@ class EnerTalkBillingSensor(EnerTalkSensor):
         """Initialize the Billing Sensor."""
         super().__init__(device, variable, variable_info)
         self.api = api
+        self.api.entities.append(self)
 
     @property
     def state(self):
@@ -222,6 +305,7 @@ class EnerTalkBillingSensor(EnerTalkSensor):
         if self.api.result is None:
             return
         return {
+            **self.api.api.cache.attributes(self.api.key),
             'period': self.api.result['period'],
             'start': datetime.fromtimestamp(
                 self.api.result['start'] / 1000,
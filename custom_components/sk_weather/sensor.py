@@ -1,6 +1,8 @@
 """Support for SK Weather Sensors."""
 import logging
-import requests
+import os
+from asyncio import run_coroutine_threadsafe
+
 import voluptuous as vol
 import homeassistant.helpers.config_validation as cv
 
@@ -8,17 +10,35 @@ from datetime import timedelta
 from homeassistant.components.sensor import PLATFORM_SCHEMA
 from homeassistant.const import (CONF_NAME, CONF_LATITUDE, CONF_LONGITUDE)
 from homeassistant.helpers.entity import Entity
-from homeassistant.util import Throttle
+from homeassistant.util import Throttle, slugify
+from homeassistant.util.async_ import run_callback_threadsafe
+
+from ..common.cache import EndpointCache
+from ..common.profiler import (
+    COMMON_PATH,
+    SERVICE_PROFILE,
+    async_register_profile_service,
+)
+from ..common.response import ResponseDecoder
+from ..common.transport import (
+    async_get_transport,
+    async_register_stats_service,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+DOMAIN = 'sk_weather'
+
 CONF_APP_KEY = 'app_key'
 CONF_SUMMARY_INTERVAL = 'summary_interval'
 CONF_MINUTELY_INTERVAL = 'minutely_interval'
 CONF_SUMMARY_MON_COND = 'summary_monitored_conditions'
 CONF_MINUTELY_MON_COND = 'minutely_monitored_conditions'
+CONF_MAX_STALENESS = 'max_staleness'
 
 SK_WEATHER_API_URL = 'https://api2.sktelecom.com'
+SK_WEATHER_MAX_CONNECTIONS = 2
+SK_WEATHER_TIMEOUT = 10
 DEFAULT_NAME = 'SK Weather'
 
 MIN_TIME_BETWEEN_UPDATES = timedelta(seconds=30)
@@ -58,6 +78,8 @@ PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend({
         vol.All(cv.time_period, cv.positive_timedelta),
     vol.Optional(CONF_MINUTELY_INTERVAL, default=timedelta(seconds=600)):
         vol.All(cv.time_period, cv.positive_timedelta),
+    vol.Optional(CONF_MAX_STALENESS, default=timedelta(hours=6)):
+        vol.All(cv.time_period, cv.positive_timedelta),
     vol.Optional(CONF_SUMMARY_MON_COND):
         vol.All(cv.ensure_list, [vol.In(_SUMMARY_MON_COND)]),
     vol.Optional(CONF_MINUTELY_MON_COND):
@@ -76,8 +98,14 @@ def setup_platform(hass, config, add_entities, discovery_info=None):
     minutely_interval = config.get(CONF_MINUTELY_INTERVAL)
     summary_monitored_conditions = config.get(CONF_SUMMARY_MON_COND)
     minutely_monitored_conditions = config.get(CONF_MINUTELY_MON_COND)
+    max_staleness = config.get(CONF_MAX_STALENESS)
 
-    api = SKWeatherAPI(app_key)
+    transport = run_callback_threadsafe(
+        hass.loop, async_get_transport, hass).result()
+    cache = EndpointCache(
+        hass, '{}.{}'.format(DOMAIN, slugify(name)), max_staleness)
+    run_coroutine_threadsafe(cache.async_load(), hass.loop).result()
+    api = SKWeatherAPI(app_key, transport, cache)
 
     sensors = []
     if summary_monitored_conditions is not None:
@@ -98,6 +126,11 @@ def setup_platform(hass, config, add_entities, discovery_info=None):
 
     add_entities(sensors, True)
 
+    if not hass.services.has_service(DOMAIN, SERVICE_PROFILE):
+        hass.add_job(async_register_profile_service,
+                     hass, DOMAIN, [os.path.dirname(__file__)], [COMMON_PATH])
+        hass.add_job(async_register_stats_service, hass, DOMAIN)
+
 
 def get_sky_icon(sky_code):
     sky_code = sky_code[4:]
@@ -126,43 +159,69 @@ def get_sky_icon(sky_code):
 
 class SKWeatherAPI:
     """SK Weather API."""
-    def __init__(self, app_key):
+    def __init__(self, app_key, transport, cache):
         """Initialize the SK Weather API.."""
         self.app_key = app_key
+        self.decoder = ResponseDecoder(_LOGGER)
+        self.transport = transport
+        self.cache = cache
+        self.transport.configure_host(
+            SK_WEATHER_API_URL, SK_WEATHER_MAX_CONNECTIONS, SK_WEATHER_TIMEOUT)
 
     def get(self, url):
+        """Return an endpoint, from the cache while it fails."""
+        return self.cache.fetch(url, lambda: self._get(url))
+
+    def _get(self, url):
         headers = {'appKey': '{}'.format(self.app_key)}
         try:
-            response = requests.get(
-                '{}{}'.format(SK_WEATHER_API_URL, url),
-                headers=headers, timeout=10)
+            response = self.transport.get(
+                '{}{}'.format(SK_WEATHER_API_URL, url), headers=headers)
             response.raise_for_status()
-            _LOGGER.debug('JSON Response: %s', response.content.decode('utf8'))
-            return response.json()
+            return self.decoder.decode(response)
         except Exception as ex:
             _LOGGER.error('Failed to update Weather API status Error: %s', ex)
             raise
 
 
-class SKWeatherSummaryAPI:
+class SKWeatherDataAPI:
+    """Base of the SK Weather Apis shared by a group of sensors."""
+
+    def __init__(self, api, url):
+        """Initialize of a SK Weather Api."""
+        self.api = api
+        self.url = url
+        self.sensors = []
+        self.result = {}
+        self.api.cache.register(self.url, self.refresh)
+
+    def refresh(self):
+        """Refresh the api and the states of its sensors."""
+        self.update(no_throttle=True)
+        for sensor in self.sensors:
+            sensor.update(no_throttle=True)
+            if sensor.hass is not None:
+                sensor.schedule_update_ha_state()
+
+
+class SKWeatherSummaryAPI(SKWeatherDataAPI):
     """Representation of a SK Weather Summary Api."""
 
     def __init__(self, lat, lon, api):
         """Initialize of a SK Weather Summary Api."""
         self.lat = lat
         self.lon = lon
-        self.api = api
-        self.result = {}
+        url = '/weather/summary?version=2&lat={}&lon={}' \
+            .format(self.lat, self.lon)
+        super().__init__(api, url)
 
     @Throttle(MIN_TIME_BETWEEN_UPDATES)
     def update(self):
         """Update function for updating api information."""
-        url = '/weather/summary?version=2&lat={}&lon={}' \
-            .format(self.lat, self.lon)
-        self.result = self.api.get(url)['weather']['summary'][0]
+        self.result = self.api.get(self.url)['weather']['summary'][0]
 
 
-class SKWeatherMinutelyAPI:
+class SKWeatherMinutelyAPI(SKWeatherDataAPI):
     """Representation of a SK Weather Minutely Api."""
 
     def __init__(self, lat, lon, grid, api):
@@ -172,16 +231,15 @@ class SKWeatherMinutelyAPI:
         self.city = grid['city']
         self.county = grid['county']
         self.village = grid['village']
-        self.api = api
-        self.result = {}
+        url = '/weather/current/minutely' \
+              '?version=2&lat={}&lon={}&city={}&county={}&village={}' \
+            .format(self.lat, self.lon, self.city, self.county, self.village)
+        super().__init__(api, url)
 
     @Throttle(MIN_TIME_BETWEEN_UPDATES)
     def update(self):
         """Update function for updating api information."""
-        url = '/weather/current/minutely' \
-              '?version=2&lat={}&lon={}&city={}&county={}&village={}' \
-            .format(self.lat, self.lon, self.city, self.county, self.village)
-        self.result = self.api.get(url)['weather']['minutely'][0]
+        self.result = self.api.get(self.url)['weather']['minutely'][0]
 
 
 class SKWeatherSensor(Entity):
@@ -224,6 +282,11 @@ class SKWeatherSensor(Entity):
         """Return the state of the sensor."""
         return self.var_state
 
+    @property
+    def device_state_attributes(self):
+        """Return the age of the data of the sensor."""
+        return self.api.api.cache.attributes(self.api.url)
+
 
 class SKWeatherSummarySensor(SKWeatherSensor):
     """Representation of a SK Weather Summary Sensor."""
@@ -232,6 +295,7 @@ class SKWeatherSummarySensor(SKWeatherSensor):
         """Initialize the SK Weather Summary Sensor."""
         super().__init__(name, variable, variable_info)
         self.api = api
+        self.api.sensors.append(self)
         self.update = Throttle(interval)(self.update)
 
     def update(self):
@@ -267,6 +331,7 @@ class SKWeatherMinutelySensor(SKWeatherSensor):
         self.county = grid['county']
         self.village = grid['village']
         self.api = api
+        self.api.sensors.append(self)
         self.update = Throttle(interval)(self.update)
 
     def update(self):